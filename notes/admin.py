@@ -1,5 +1,6 @@
 from django.contrib import admin
 
-from .models import Note
+from .models import ArchivedNote, Note
 
 admin.site.register(Note)
+admin.site.register(ArchivedNote)
@@ -0,0 +1,112 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DatabaseError, IntegrityError, connection, transaction
+from django.utils import timezone
+
+from .models import ArchivedNote, Note
+
+ARCHIVE_AFTER_DAYS = getattr(settings, 'NOTES_ARCHIVE_AFTER_DAYS', 365)
+ARCHIVE_BATCH_SIZE = getattr(settings, 'NOTES_ARCHIVE_BATCH_SIZE', 500)
+# Отметка о прочтении пишется в базу не чаще раза за этот промежуток.
+ACCESS_RESOLUTION = timedelta(days=1)
+
+
+def touch(note):
+    """Запоминает обращение к заметке."""
+    now = timezone.now()
+    if now - note.last_accessed < ACCESS_RESOLUTION:
+        return
+    Note.objects.filter(pk=note.pk).update(last_accessed=now)
+    note.last_accessed = now
+
+
+def _table_storage(table):
+    """Страницы и байты, занятые таблицей и её индексами в SQLite.
+
+    Возвращает (None, None), если база не SQLite или собрана без dbstat.
+    """
+    if connection.vendor != 'sqlite':
+        return None, None
+    try:
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT COUNT(*), COALESCE(SUM(pgsize), 0) FROM dbstat '
+                'WHERE name IN '
+                '(SELECT name FROM sqlite_master WHERE tbl_name = %s)',
+                (table,),
+            )
+            return cursor.fetchone()
+    except DatabaseError:
+        return None, None
+
+
+def hot_table_stats():
+    """Число заметок в основной таблице и место, которое она занимает."""
+    pages, size = _table_storage(Note._meta.db_table)
+    return {'notes': Note.objects.count(), 'pages': pages, 'bytes': size}
+
+
+def archive_stale_notes(days=ARCHIVE_AFTER_DAYS,
+                        batch_size=ARCHIVE_BATCH_SIZE):
+    """Переносит в архив заметки, не открывавшиеся дольше days дней."""
+    cutoff = timezone.now() - timedelta(days=days)
+    stale = Note.objects.filter(last_accessed__lt=cutoff).order_by('pk')
+    before = hot_table_stats()
+    archived = 0
+    while True:
+        with transaction.atomic():
+            batch = list(stale[:batch_size])
+            if not batch:
+                break
+            ArchivedNote.objects.bulk_create(
+                ArchivedNote.from_note(note) for note in batch
+            )
+            Note.objects.filter(pk__in=[note.pk for note in batch]).delete()
+        archived += len(batch)
+    return {
+        'archived': archived,
+        'before': before,
+        'after': hot_table_stats(),
+    }
+
+
+def _free_slug(slug, note_id):
+    """Исходный slug или первый свободный вариант с суффиксом."""
+    max_slug_length = Note._meta.get_field('slug').max_length
+    candidate, attempt = slug, 1
+    while (
+        Note.objects.filter(slug=candidate).exists()
+        or ArchivedNote.objects.filter(
+            slug=candidate
+        ).exclude(note_id=note_id).exists()
+    ):
+        suffix = f'-{note_id}' if attempt == 1 else f'-{note_id}-{attempt}'
+        candidate = slug[:max_slug_length - len(suffix)] + suffix
+        attempt += 1
+    return candidate
+
+
+def restore(archived_note):
+    """Возвращает заметку из архива в основную таблицу.
+
+    Если заметку уже вернул параллельный запрос, отдаёт её.
+    """
+    with transaction.atomic():
+        locked = ArchivedNote.objects.select_for_update().filter(
+            pk=archived_note.pk
+        ).first()
+        if locked is None:
+            return Note.objects.get(pk=archived_note.note_id)
+        note = locked.to_note()
+        note.slug = _free_slug(note.slug, note.pk)
+        try:
+            with transaction.atomic():
+                note.save(force_insert=True)
+        except IntegrityError:
+            restored = Note.objects.filter(pk=note.pk).first()
+            if restored is None:
+                raise
+            return restored
+        locked.delete()
+    return note
@@ -3,7 +3,7 @@ from pytils.translit import slugify
 from django import forms
 from django.core.exceptions import ValidationError
 
-from .models import Note
+from .models import ArchivedNote, Note
 
 WARNING = ' - такой slug уже существует, придумайте уникальное значение!'
 
@@ -22,8 +22,9 @@ class NoteForm(forms.ModelForm):
         if not slug:
             title = cleaned_data.get('title')
             slug = slugify(title)[:100]
-        if Note.objects.filter(
-                slug=slug
-        ).exclude(id=self.instance.pk).exists():
+        slug_taken = Note.objects.filter(
+            slug=slug
+        ).exclude(id=self.instance.pk).exists()
+        if slug_taken or ArchivedNote.objects.filter(slug=slug).exists():
             raise ValidationError(slug + WARNING)
         return slug
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+
+from notes import archive
+
+
+class Command(BaseCommand):
+    help = 'Переносит давно не открывавшиеся заметки в архив.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=archive.ARCHIVE_AFTER_DAYS,
+            help='Архивировать заметки, не открывавшиеся столько дней.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=archive.ARCHIVE_BATCH_SIZE,
+            help='Сколько заметок переносить за одну транзакцию.',
+        )
+
+    def handle(self, *args, **options):
+        result = archive.archive_stale_notes(
+            days=options['days'], batch_size=options['batch_size']
+        )
+        before, after = result['before'], result['after']
+        self.stdout.write(
+            f'Перенесено в архив: {result["archived"]}\n'
+            f'Заметок в основной таблице: {before["notes"]} -> '
+            f'{after["notes"]}\n'
+            f'Страниц таблицы и индексов: {before["pages"]} -> '
+            f'{after["pages"]}\n'
+            f'Байт: {before["bytes"]} -> {after["bytes"]}'
+        )
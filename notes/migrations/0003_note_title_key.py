@@ -0,0 +1,48 @@
+# Generated by Django 5.1.1 on 2026-10-19 19:55
+
+from django.conf import settings
+from django.db import migrations, models
+
+from pytils.translit import translify
+
+BATCH_SIZE = 500
+
+
+def normalize(value):
+    # Копия notes.search.normalize на момент создания миграции.
+    value = translify(str(value).casefold(), strict=False)
+    return ' '.join(value.split()).lower()
+
+
+def fill_title_key(apps, schema_editor):
+    Note = apps.get_model('notes', 'Note')
+    notes = Note.objects.only('id', 'title').order_by('pk')
+    batch = []
+    for note in notes.iterator(chunk_size=BATCH_SIZE):
+        note.title_key = normalize(note.title)[:300]
+        batch.append(note)
+        if len(batch) == BATCH_SIZE:
+            Note.objects.bulk_update(batch, ('title_key',))
+            batch = []
+    Note.objects.bulk_update(batch, ('title_key',))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notes', '0002_alter_note_title'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='note',
+            name='title_key',
+            field=models.CharField(blank=True, editable=False, max_length=300, verbose_name='Ключ поиска по заголовку'),
+        ),
+        migrations.AddIndex(
+            model_name='note',
+            index=models.Index(fields=['author', 'title_key'], name='note_author_title_key_idx'),
+        ),
+        migrations.RunPython(fill_title_key, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.1.1 on 2026-10-19 19:56
+
+import datetime
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+# Обращения к заметкам до этой миграции не отслеживались: существующие
+# заметки считаются давно не открывавшимися и попадут под архивацию.
+NEVER_ACCESSED = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notes', '0003_note_title_key'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='note',
+            name='last_accessed',
+            field=models.DateTimeField(default=NEVER_ACCESSED, editable=False, verbose_name='Последнее обращение'),
+            preserve_default=False,
+        ),
+        migrations.AlterField(
+            model_name='note',
+            name='last_accessed',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False, verbose_name='Последнее обращение'),
+        ),
+        migrations.CreateModel(
+            name='ArchivedNote',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('note_id', models.BigIntegerField(unique=True, verbose_name='ID заметки')),
+                ('title', models.CharField(max_length=100, verbose_name='Заголовок')),
+                ('text', models.BinaryField(verbose_name='Сжатый текст')),
+                ('slug', models.SlugField(max_length=100, unique=True, verbose_name='Адрес для страницы с заметкой')),
+                ('last_accessed', models.DateTimeField(verbose_name='Последнее обращение')),
+                ('archived_at', models.DateTimeField(auto_now_add=True, verbose_name='Перенесена в архив')),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'архивная заметка',
+                'verbose_name_plural': 'Архивные заметки',
+            },
+        ),
+    ]
@@ -1,8 +1,14 @@
+import zlib
+
 from django.conf import settings
-from django.db import models
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, models
+from django.utils import timezone
 
 from pytils.translit import slugify
 
+from .search import normalize
+
 
 class Note(models.Model):
     title = models.CharField(
@@ -27,12 +33,98 @@ class Note(models.Model):
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
     )
+    title_key = models.CharField(
+        'Ключ поиска по заголовку',
+        max_length=300,
+        blank=True,
+        editable=False,
+    )
+    last_accessed = models.DateTimeField(
+        'Последнее обращение',
+        default=timezone.now,
+        editable=False,
+    )
+
+    class Meta:
+        indexes = (
+            models.Index(
+                fields=('author', 'title_key'),
+                name='note_author_title_key_idx',
+            ),
+        )
 
     def __str__(self):
         return self.title
 
+    def _default_slug(self):
+        max_slug_length = self._meta.get_field('slug').max_length
+        return slugify(self.title)[:max_slug_length]
+
+    def _slug_is_archived(self, slug):
+        """Slug архивной заметки занят, пока её не вернули из архива."""
+        return ArchivedNote.objects.filter(
+            slug=slug
+        ).exclude(note_id=self.pk).exists()
+
+    def clean(self):
+        slug = self.slug or self._default_slug()
+        if self._slug_is_archived(slug):
+            raise ValidationError(
+                {'slug': f'{slug} - такой slug занят архивной заметкой.'}
+            )
+
     def save(self, *args, **kwargs):
         if not self.slug:
-            max_slug_length = self._meta.get_field('slug').max_length
-            self.slug = slugify(self.title)[:max_slug_length]
+            self.slug = self._default_slug()
+        if self._slug_is_archived(self.slug):
+            raise IntegrityError(
+                f'Slug {self.slug} занят архивной заметкой.'
+            )
+        max_key_length = self._meta.get_field('title_key').max_length
+        self.title_key = normalize(self.title)[:max_key_length]
         super().save(*args, **kwargs)
+
+
+class ArchivedNote(models.Model):
+    """Заметка, давно не открывавшаяся и перенесённая в архив."""
+    note_id = models.BigIntegerField('ID заметки', unique=True)
+    title = models.CharField('Заголовок', max_length=100)
+    text = models.BinaryField('Сжатый текст')
+    slug = models.SlugField(
+        'Адрес для страницы с заметкой',
+        max_length=100,
+        unique=True,
+    )
+    author = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+    )
+    last_accessed = models.DateTimeField('Последнее обращение')
+    archived_at = models.DateTimeField('Перенесена в архив', auto_now_add=True)
+
+    class Meta:
+        verbose_name = 'архивная заметка'
+        verbose_name_plural = 'Архивные заметки'
+
+    def __str__(self):
+        return self.title
+
+    @classmethod
+    def from_note(cls, note):
+        return cls(
+            note_id=note.pk,
+            title=note.title,
+            text=zlib.compress(note.text.encode()),
+            slug=note.slug,
+            author_id=note.author_id,
+            last_accessed=note.last_accessed,
+        )
+
+    def to_note(self):
+        return Note(
+            pk=self.note_id,
+            title=self.title,
+            text=zlib.decompress(self.text).decode(),
+            slug=self.slug,
+            author_id=self.author_id,
+        )
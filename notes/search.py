@@ -0,0 +1,65 @@
+import hashlib
+import time
+
+from django.core.cache import cache
+from pytils.translit import translify
+
+AUTOCOMPLETE_LIMIT = 10
+AUTOCOMPLETE_CACHE_TIMEOUT = 300
+# Максимальный символ Unicode: верхняя граница диапазона для поиска
+# по префиксу, позволяющая SQLite использовать обычный B-tree индекс.
+PREFIX_UPPER_BOUND = chr(0x10FFFF)
+
+
+def normalize(value):
+    """Приводит строку к ключу поиска: casefold, транслит, пробелы."""
+    value = translify(str(value).casefold(), strict=False)
+    return ' '.join(value.split()).lower()
+
+
+def prefix_range(prefix):
+    """Границы диапазона строк, начинающихся с prefix."""
+    return prefix, prefix + PREFIX_UPPER_BOUND
+
+
+def _generation_key(author_id):
+    return f'notes:autocomplete:generation:{author_id}'
+
+
+def invalidate(author_id):
+    """Сбрасывает закэшированные подсказки пользователя."""
+    cache.set(_generation_key(author_id), time.time_ns(), None)
+
+
+def suggest(queryset, author_id, query, limit=AUTOCOMPLETE_LIMIT):
+    """Заметки, заголовок или slug которых начинается с query."""
+    prefix = normalize(query)
+    if not prefix:
+        return []
+    generation = cache.get_or_set(
+        _generation_key(author_id), time.time_ns, None
+    )
+    digest = hashlib.md5(prefix.encode()).hexdigest()
+    cache_key = f'notes:autocomplete:{author_id}:{generation}:{limit}:{digest}'
+    suggestions = cache.get(cache_key)
+    if suggestions is None:
+        suggestions = _lookup(queryset, prefix, limit)
+        cache.set(cache_key, suggestions, AUTOCOMPLETE_CACHE_TIMEOUT)
+    return suggestions
+
+
+def _lookup(queryset, prefix, limit):
+    fields = ('title', 'slug')
+    by_title = queryset.filter(
+        title_key__range=prefix_range(prefix)
+    ).order_by('title_key').values_list(*fields)[:limit]
+    by_slug = queryset.filter(
+        slug__range=prefix_range(prefix.replace(' ', '-'))
+    ).order_by('slug').values_list(*fields)[:limit]
+    suggestions = {}
+    for title, slug in (*by_title, *by_slug):
+        suggestions.setdefault(slug, title)
+    return [
+        {'title': title, 'slug': slug}
+        for slug, title in list(suggestions.items())[:limit]
+    ]
@@ -0,0 +1,12 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import search
+from .models import Note
+
+
+@receiver(post_save, sender=Note)
+@receiver(post_delete, sender=Note)
+def invalidate_autocomplete(sender, instance, **kwargs):
+    """Подсказки автора устаревают при любом изменении его заметок."""
+    search.invalidate(instance.author_id)
@@ -0,0 +1,163 @@
+# test_archive.py
+from datetime import timedelta
+from http import HTTPStatus
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.db import IntegrityError
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from notes import archive
+from notes.forms import NoteForm
+from notes.models import ArchivedNote, Note
+
+User = get_user_model()
+
+
+class TestArchive(TestCase):
+    NOTE_TEXT = 'Текст старой заметки. ' * 10
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create(username='Автор заметок')
+        cls.reader = User.objects.create(username='Читатель')
+        cls.stale_note = Note.objects.create(
+            title='Старая заметка',
+            text=cls.NOTE_TEXT,
+            slug='stale-note',
+            author=cls.author
+        )
+        Note.objects.filter(pk=cls.stale_note.pk).update(
+            last_accessed=timezone.now() - timedelta(days=400)
+        )
+        cls.fresh_note = Note.objects.create(
+            title='Новая заметка',
+            text='Текст заметки.',
+            slug='fresh-note',
+            author=cls.author
+        )
+        cls.detail_url = reverse('notes:detail', args=('stale-note',))
+
+    def setUp(self):
+        self.client.force_login(self.author)
+
+    def test_archive_moves_only_stale_notes(self):
+        result = archive.archive_stale_notes(days=365, batch_size=1)
+        self.assertEqual(result['archived'], 1)
+        self.assertEqual(result['before']['notes'], 2)
+        self.assertEqual(result['after']['notes'], 1)
+        self.assertGreater(result['before']['pages'], 0)
+        self.assertGreater(result['before']['bytes'], 0)
+        self.assertFalse(Note.objects.filter(slug='stale-note').exists())
+        archived = ArchivedNote.objects.get()
+        self.assertEqual(archived.note_id, self.stale_note.pk)
+        self.assertLess(len(archived.text), len(self.NOTE_TEXT.encode()))
+
+    def test_detail_restores_archived_note(self):
+        archive.archive_stale_notes(days=365)
+        response = self.client.get(self.detail_url)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(response.context['note'].text, self.NOTE_TEXT)
+        self.assertFalse(ArchivedNote.objects.exists())
+        note = Note.objects.get(slug='stale-note')
+        self.assertEqual(note.pk, self.stale_note.pk)
+        self.assertGreater(
+            note.last_accessed, timezone.now() - timedelta(days=1)
+        )
+
+    def test_archive_frees_table_pages(self):
+        Note.objects.bulk_create(
+            Note(
+                title=f'Заметка {index}',
+                text='Длинный текст. ' * 300,
+                slug=f'long-note-{index}',
+                author=self.author,
+                last_accessed=timezone.now() - timedelta(days=400),
+            )
+            for index in range(50)
+        )
+        result = archive.archive_stale_notes(days=365)
+        self.assertLess(result['after']['pages'], result['before']['pages'])
+        self.assertLess(result['after']['bytes'], result['before']['bytes'])
+
+    def test_restore_twice(self):
+        archive.archive_stale_notes(days=365)
+        first, second = ArchivedNote.objects.get(), ArchivedNote.objects.get()
+        self.assertEqual(archive.restore(first), archive.restore(second))
+        self.assertEqual(Note.objects.filter(slug='stale-note').count(), 1)
+        self.assertFalse(ArchivedNote.objects.exists())
+
+    def test_archived_slug_is_reserved(self):
+        archive.archive_stale_notes(days=365)
+        note = Note(title='Stale note', text='Текст', author=self.author)
+        with self.assertRaises(ValidationError):
+            note.full_clean()
+        with self.assertRaises(IntegrityError):
+            Note.objects.create(
+                title='Stale note', text='Текст', author=self.author
+            )
+
+    def test_restore_resolves_slug_conflict(self):
+        archive.archive_stale_notes(days=365)
+        Note.objects.bulk_create([Note(
+            title='Другая заметка', text='Текст', slug='stale-note',
+            author=self.author
+        )])
+        note = archive.restore(ArchivedNote.objects.get())
+        self.assertEqual(note.slug, f'stale-note-{self.stale_note.pk}')
+        self.assertEqual(note.text, self.NOTE_TEXT)
+
+    def test_restore_skips_taken_suffixed_slug(self):
+        archive.archive_stale_notes(days=365)
+        suffixed = f'stale-note-{self.stale_note.pk}'
+        Note.objects.bulk_create([
+            Note(title='Заметка', text='Текст', slug=slug, author=self.author)
+            for slug in ('stale-note', suffixed)
+        ])
+        note = archive.restore(ArchivedNote.objects.get())
+        self.assertEqual(note.slug, f'{suffixed}-2')
+        self.assertEqual(note.pk, self.stale_note.pk)
+
+    def test_other_user_cant_restore_note(self):
+        archive.archive_stale_notes(days=365)
+        self.client.force_login(self.reader)
+        response = self.client.get(self.detail_url)
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+        self.assertTrue(ArchivedNote.objects.exists())
+
+    def test_detail_updates_last_accessed(self):
+        self.client.get(self.detail_url)
+        archive.archive_stale_notes(days=365)
+        self.assertFalse(ArchivedNote.objects.exists())
+
+    def test_list_include_archived_toggle(self):
+        archive.archive_stale_notes(days=365)
+        url = reverse('notes:list')
+        response = self.client.get(url)
+        self.assertNotIn('archived_list', response.context)
+        response = self.client.get(url, {'archived': 0})
+        self.assertNotIn('archived_list', response.context)
+        response = self.client.get(url, {'archived': 1})
+        self.assertEqual(
+            [note.slug for note in response.context['archived_list']],
+            ['stale-note']
+        )
+
+    def test_form_rejects_archived_slug(self):
+        archive.archive_stale_notes(days=365)
+        form = NoteForm(data={
+            'title': 'Заголовок', 'text': 'Текст', 'slug': 'stale-note'
+        })
+        self.assertFalse(form.is_valid())
+        self.assertIn('slug', form.errors)
+
+    def test_archive_notes_command(self):
+        out = StringIO()
+        call_command('archive_notes', '--days', '365', stdout=out)
+        self.assertIn('Перенесено в архив: 1', out.getvalue())
+        self.assertIn('Заметок в основной таблице: 2 -> 1', out.getvalue())
+        self.assertIn('Страниц таблицы и индексов:', out.getvalue())
@@ -1,6 +1,6 @@
 # test_logic.py
 from django.contrib.auth import get_user_model
-from django.test import Client, TestCase
+from django.test import Client, TestCase, override_settings
 from django.urls import reverse
 from http import HTTPStatus
 
@@ -11,7 +11,10 @@ from pytils.translit import slugify
 
 User = get_user_model()
 
+THROTTLING_DISABLED = {'ENABLED': False}
 
+
+@override_settings(NOTES_ADMISSION_CONTROL=THROTTLING_DISABLED)
 class TestNoteCreation(TestCase):
     NOTE_TITLE = 'Заголовок заметки'
     NOTE_TEXT = 'Текст заметки'
@@ -72,6 +75,7 @@ class TestNoteCreation(TestCase):
         self.assertEqual(note.author, self.user)
 
 
+@override_settings(NOTES_ADMISSION_CONTROL=THROTTLING_DISABLED)
 class TestNoteEditDelete(TestCase):
     NOTE_TITLE = 'Заголовок заметки'
     NOTE_TEXT = 'Текст заметки'
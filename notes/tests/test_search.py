@@ -0,0 +1,96 @@
+# test_search.py
+from http import HTTPStatus
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from notes.models import Note
+from notes.search import normalize
+
+User = get_user_model()
+
+
+class TestAutocomplete(TestCase):
+    AUTOCOMPLETE_URL = reverse('notes:autocomplete')
+    JUMP_URL = reverse('notes:jump')
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create(username='Автор заметок')
+        cls.reader = User.objects.create(username='Читатель')
+        cls.note = Note.objects.create(
+            title='Список Покупок',
+            text='Текст заметки.',
+            slug='shopping',
+            author=cls.author
+        )
+        Note.objects.create(
+            title='Спорт',
+            text='Текст заметки.',
+            slug='sport',
+            author=cls.author
+        )
+        Note.objects.create(
+            title='Список дел',
+            text='Текст заметки.',
+            slug='reader-todo',
+            author=cls.reader
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.author)
+
+    def get_slugs(self, query):
+        response = self.client.get(self.AUTOCOMPLETE_URL, {'q': query})
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        return [note['slug'] for note in response.json()['results']]
+
+    def test_normalize(self):
+        self.assertEqual(normalize('  Список   ПОКУПОК '), 'spisok pokupok')
+
+    def test_prefix_is_case_insensitive(self):
+        for query in ('спи', 'СПИ', 'spi'):
+            with self.subTest(query=query):
+                self.assertEqual(self.get_slugs(query), ['shopping'])
+
+    def test_matches_slug(self):
+        self.assertEqual(self.get_slugs('shop'), ['shopping'])
+
+    def test_only_own_notes(self):
+        self.assertEqual(self.get_slugs('сп'), ['shopping', 'sport'])
+
+    def test_empty_query(self):
+        self.assertEqual(self.get_slugs(''), [])
+
+    def test_cache_is_invalidated_on_save_and_delete(self):
+        self.assertEqual(self.get_slugs('спорт'), ['sport'])
+        new_note = Note.objects.create(
+            title='Спортзал',
+            text='Текст заметки.',
+            slug='gym',
+            author=self.author
+        )
+        self.assertEqual(self.get_slugs('спорт'), ['sport', 'gym'])
+        new_note.delete()
+        self.assertEqual(self.get_slugs('спорт'), ['sport'])
+
+    def test_jump_redirects_to_note(self):
+        response = self.client.get(self.JUMP_URL, {'q': 'список'})
+        self.assertRedirects(
+            response, reverse('notes:detail', args=(self.note.slug,))
+        )
+
+    def test_jump_not_found(self):
+        response = self.client.get(self.JUMP_URL, {'q': 'нет такой'})
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+
+    def test_redirect_for_anonymous_client(self):
+        self.client.logout()
+        login_url = reverse('users:login')
+        for url in (self.AUTOCOMPLETE_URL, self.JUMP_URL):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertRedirects(response, f'{login_url}?next={url}')
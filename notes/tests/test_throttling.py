@@ -0,0 +1,221 @@
+# test_throttling.py
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+import math
+import threading
+
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.test import Client, RequestFactory, TestCase, override_settings
+from django.urls import reverse
+
+from notes.models import Note
+from notes.throttling import (
+    CacheConcurrencyLimiter, CacheStore, ConcurrencyLimiter, LocalStore,
+    get_client_ip, local_store
+)
+
+User = get_user_model()
+
+
+class TestLimiters(TestCase):
+
+    def test_token_bucket(self):
+        store = LocalStore()
+        for _ in range(3):
+            self.assertEqual(store.token_bucket('key', 1, 3, now=0), 0)
+        self.assertEqual(store.token_bucket('key', 1, 3, now=0), 1)
+        self.assertEqual(store.token_bucket('key', 1, 3, now=1), 0)
+
+    def test_sliding_window(self):
+        store = LocalStore()
+        for _ in range(2):
+            self.assertEqual(store.sliding_window('key', 2, 10, now=5), 0)
+        # Через 10 секунд прошлое окно учитывается лишь наполовину.
+        self.assertEqual(store.sliding_window('key', 2, 10, now=5), 10)
+        # В середине следующего окна половина прошлых запросов забыта.
+        self.assertEqual(store.sliding_window('key', 2, 10, now=15), 0)
+        self.assertGreater(store.sliding_window('key', 2, 10, now=15), 0)
+
+    def test_expired_entries_are_removed(self):
+        store = LocalStore(stripes=1, sweep_every=1)
+        for index in range(100):
+            store.sliding_window(f'ip:{index}', 10, 10, now=0)
+            store.token_bucket(f'user:{index}', 1, 5, now=0)
+        self.assertEqual(len(store), 200)
+        # Корзины наполнились через 1 секунду, окна устарели через 20.
+        store.token_bucket('user:new', 1, 5, now=10)
+        self.assertEqual(len(store), 101)
+        store.sliding_window('ip:new', 10, 10, now=20)
+        self.assertEqual(len(store), 1)
+
+    def test_client_ip_behind_proxy(self):
+        request = RequestFactory().post(
+            '/', REMOTE_ADDR='10.0.0.1',
+            HTTP_X_FORWARDED_FOR='6.6.6.6, 1.2.3.4',
+        )
+        self.assertEqual(get_client_ip(request), '10.0.0.1')
+        self.assertEqual(get_client_ip(request, 1), '1.2.3.4')
+        self.assertEqual(get_client_ip(request, 2), '6.6.6.6')
+        self.assertEqual(get_client_ip(request, 3), '10.0.0.1')
+
+    def test_cache_store(self):
+        cache = caches['default']
+        cache.clear()
+        store = CacheStore(cache)
+        self.assertEqual(store.sliding_window('key', 1, 10, now=5), 0)
+        self.assertEqual(store.sliding_window('key', 1, 10, now=5), 15)
+        self.assertEqual(store.token_bucket('key', 1, 1, now=0), 0)
+        self.assertEqual(store.token_bucket('key', 1, 1, now=0), 1)
+
+    def test_cache_store_does_not_count_rejected_requests(self):
+        cache = caches['default']
+        cache.clear()
+        store = CacheStore(cache)
+        for _ in range(2):
+            self.assertEqual(store.sliding_window('key', 2, 10, now=1), 0)
+        for now in range(2, 10):
+            retry_after = store.sliding_window('key', 2, 10, now=now)
+            self.assertGreater(retry_after, 0)
+        # Клиент, подождавший Retry-After, проходит в следующем окне.
+        now = 9 + math.ceil(retry_after)
+        self.assertEqual(store.sliding_window('key', 2, 10, now=now), 0)
+
+    def test_retry_after_is_honoured(self):
+        # Клиент шлёт 2 запроса в секунду и после отказа ждёт Retry-After.
+        for store in (LocalStore(), CacheStore(caches['default'])):
+            caches['default'].clear()
+            with self.subTest(store=type(store).__name__):
+                now = 0
+                admitted = 0
+                while now < 100:
+                    retry_after = store.sliding_window('key', 10, 10, now=now)
+                    admitted += not retry_after
+                    now += math.ceil(retry_after) if retry_after else 0.5
+                self.assertGreaterEqual(admitted, 90)
+
+    def test_cache_concurrency_limiter(self):
+        cache = caches['default']
+        cache.clear()
+        limiter = CacheConcurrencyLimiter(cache)
+        other_process = CacheConcurrencyLimiter(cache)
+        self.assertTrue(limiter.acquire(2))
+        self.assertTrue(other_process.acquire(2))
+        self.assertFalse(limiter.acquire(2))
+        other_process.release()
+        self.assertTrue(limiter.acquire(2))
+
+    def test_token_bucket_under_concurrent_load(self):
+        store = LocalStore()
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            results = list(executor.map(
+                lambda _: store.token_bucket('key', 1e-9, 100, now=0),
+                range(1000)
+            ))
+        self.assertEqual(results.count(0), 100)
+
+    def test_sliding_window_under_concurrent_load(self):
+        store = LocalStore()
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            results = list(executor.map(
+                lambda _: store.sliding_window('key', 100, 60, now=0),
+                range(1000)
+            ))
+        self.assertEqual(results.count(0), 100)
+
+    def test_concurrency_limiter_under_concurrent_load(self):
+        limiter = ConcurrencyLimiter()
+        barrier = threading.Barrier(16)
+
+        def acquire(_):
+            barrier.wait()
+            return limiter.acquire(4)
+
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            results = list(executor.map(acquire, range(16)))
+        self.assertEqual(results.count(True), 4)
+        for _ in range(4):
+            limiter.release()
+        self.assertEqual(limiter.active, 0)
+
+
+@override_settings(NOTES_ADMISSION_CONTROL={
+    'USER_RATE': 1e-9, 'USER_BURST': 2, 'IP_LIMIT': 3, 'IP_WINDOW': 60,
+})
+class TestAdmissionControl(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create(username='Автор заметок')
+        cls.author_client = Client()
+        cls.author_client.force_login(cls.author)
+        cls.add_url = reverse('notes:add')
+
+    def setUp(self):
+        local_store.clear()
+
+    def create_note(self, index, client=None):
+        client = client or self.author_client
+        return client.post(self.add_url, data={
+            'title': f'Заметка {index}',
+            'text': 'Текст заметки.',
+            'slug': f'note-{index}',
+        })
+
+    def test_user_is_throttled(self):
+        for index in range(2):
+            self.assertEqual(
+                self.create_note(index).status_code, HTTPStatus.FOUND
+            )
+        response = self.create_note(2)
+        self.assertEqual(response.status_code, HTTPStatus.TOO_MANY_REQUESTS)
+        self.assertGreaterEqual(int(response['Retry-After']), 1)
+        self.assertEqual(Note.objects.count(), 2)
+
+    def test_user_over_bucket_does_not_spend_ip_window(self):
+        for index in range(2):
+            self.create_note(index)
+        for index in range(2, 5):
+            response = self.create_note(index)
+            self.assertEqual(
+                response.status_code, HTTPStatus.TOO_MANY_REQUESTS
+            )
+        neighbour = User.objects.create(username='Сосед по NAT')
+        neighbour_client = Client()
+        neighbour_client.force_login(neighbour)
+        response = self.create_note(5, client=neighbour_client)
+        self.assertEqual(response.status_code, HTTPStatus.FOUND)
+
+    def test_reads_are_not_throttled(self):
+        for _ in range(5):
+            response = self.author_client.get(self.add_url)
+            self.assertEqual(response.status_code, HTTPStatus.OK)
+
+    def test_ip_is_throttled_on_signup(self):
+        url = reverse('users:signup')
+        for _ in range(3):
+            self.client.post(url, data={})
+        response = self.client.post(url, data={})
+        self.assertEqual(response.status_code, HTTPStatus.TOO_MANY_REQUESTS)
+        self.assertIn('Retry-After', response)
+
+    def test_concurrency_limit(self):
+        with override_settings(
+            NOTES_ADMISSION_CONTROL={'MAX_CONCURRENT_WRITES': 0}
+        ):
+            for index in range(3):
+                response = self.create_note(index)
+                self.assertEqual(
+                    response.status_code, HTTPStatus.TOO_MANY_REQUESTS
+                )
+                self.assertEqual(response['Retry-After'], '1')
+        # Отклонённые запросы не списали бюджет пользователя.
+        for index in range(2):
+            self.assertEqual(
+                self.create_note(index).status_code, HTTPStatus.FOUND
+            )
+
+    @override_settings(NOTES_ADMISSION_CONTROL={'MAX_CONCURRENT_WRITES': 0})
+    def test_anonymous_user_is_redirected_before_admission(self):
+        response = self.create_note(0, client=self.client)
+        self.assertEqual(response.status_code, HTTPStatus.FOUND)
@@ -0,0 +1,342 @@
+import math
+import threading
+import time
+from functools import wraps
+from http import HTTPStatus
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+
+DEFAULTS = {
+    'ENABLED': True,
+    # Токены на пользователя: скорость пополнения в секунду и ёмкость.
+    'USER_RATE': 1.0,
+    'USER_BURST': 20,
+    # Скользящее окно на IP: не больше IP_LIMIT запросов за IP_WINDOW секунд.
+    'IP_LIMIT': 60,
+    'IP_WINDOW': 60,
+    # Сколько изменяющих запросов обрабатывается одновременно. Без CACHE
+    # лимит действует в каждом процессе отдельно: при N воркерах к базе
+    # может прийти до N * MAX_CONCURRENT_WRITES записей; с CACHE он общий.
+    'MAX_CONCURRENT_WRITES': 4,
+    # Сколько доверенных обратных прокси стоит перед приложением.
+    # 0 - адрес клиента берётся из REMOTE_ADDR; иначе из X-Forwarded-For,
+    # в которое каждый прокси дописывает адрес своего клиента.
+    'TRUSTED_PROXY_COUNT': 0,
+    # Алиас кэша из CACHES для общего между процессами состояния.
+    # None - состояние хранится в памяти процесса.
+    'CACHE': None,
+}
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+LOCK_STRIPES = 64
+# Как часто (в обращениях к полосе) из неё удаляются устаревшие записи.
+SWEEP_EVERY = 256
+# Срок жизни общего счётчика параллельных запросов: ограничивает,
+# сколько продержатся места, не освобождённые упавшим процессом.
+CONCURRENCY_TIMEOUT = 60
+THROTTLED_MESSAGE = 'Слишком много запросов, попробуйте позже.'
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, 'NOTES_ADMISSION_CONTROL', {})}
+
+
+def _sliding_window_retry(prev, curr, elapsed, limit, window):
+    """Через сколько секунд оценка окна опустится ниже limit."""
+    if curr + 1 > limit:
+        # Текущее окно станет прошлым и должно достаточно устареть.
+        rollover = window * (1 - (limit - 1) / curr) if curr else 0
+        return window - elapsed + max(0, rollover)
+    return window * (1 - (limit - curr - 1) / prev) - elapsed
+
+
+class LocalStore:
+    """Состояние лимитов в памяти процесса.
+
+    Ключи распределены по нескольким блокировкам, поэтому запросы
+    разных пользователей почти не ждут друг друга. Каждая запись хранит
+    момент, после которого она ничего не ограничивает: корзина снова
+    полна, окно старше двух длин окна. Такие записи периодически
+    удаляются, чтобы поток запросов с разных адресов не занимал память.
+    """
+
+    clock = staticmethod(time.monotonic)
+
+    def __init__(self, stripes=LOCK_STRIPES, sweep_every=SWEEP_EVERY):
+        self._stripes = [
+            (threading.Lock(), {}) for _ in range(stripes)
+        ]
+        self._calls = [0] * stripes
+        self.sweep_every = sweep_every
+
+    def _stripe(self, key):
+        return hash(key) % len(self._stripes)
+
+    def __len__(self):
+        return sum(len(state) for _, state in self._stripes)
+
+    def clear(self):
+        for lock, state in self._stripes:
+            with lock:
+                state.clear()
+
+    def _sweep(self, index, now):
+        """Удаляет устаревшие записи полосы; вызывается под её блокировкой."""
+        self._calls[index] += 1
+        if self._calls[index] % self.sweep_every:
+            return
+        state = self._stripes[index][1]
+        for key in [key for key, value in state.items() if value[-1] <= now]:
+            del state[key]
+
+    def token_bucket(self, key, rate, capacity, now=None):
+        """Забирает токен; возвращает 0 или время ожидания в секундах."""
+        now = self.clock() if now is None else now
+        index = self._stripe(key)
+        lock, state = self._stripes[index]
+        with lock:
+            self._sweep(index, now)
+            tokens, last, _ = state.get(key, (capacity, now, now))
+            tokens = min(capacity, tokens + (now - last) * rate)
+            admitted = tokens >= 1
+            if admitted:
+                tokens -= 1
+            state[key] = (tokens, now, now + (capacity - tokens) / rate)
+        return 0 if admitted else (1 - tokens) / rate
+
+    def sliding_window(self, key, limit, window, now=None):
+        """Учитывает запрос; возвращает 0 или время ожидания в секундах."""
+        now = self.clock() if now is None else now
+        current, elapsed = divmod(now, window)
+        index = self._stripe(key)
+        lock, state = self._stripes[index]
+        with lock:
+            self._sweep(index, now)
+            start, prev, curr, _ = state.get(key, (current, 0, 0, now))
+            if start != current:
+                prev = curr if start == current - 1 else 0
+                curr = 0
+            admitted = prev * (1 - elapsed / window) + curr + 1 <= limit
+            if admitted:
+                curr += 1
+            state[key] = (current, prev, curr, (current + 2) * window)
+        if admitted:
+            return 0
+        return _sliding_window_retry(prev, curr, elapsed, limit, window)
+
+    def release_window(self, key, window, now):
+        """Возвращает в окно запрос, который отклонил другой лимит."""
+        current = now // window
+        lock, state = self._stripes[self._stripe(key)]
+        with lock:
+            start, prev, curr, expires = state.get(key, (None, 0, 0, now))
+            if start == current and curr:
+                state[key] = (start, prev, curr - 1, expires)
+
+
+class CacheStore:
+    """Состояние лимитов в общем кэше Django.
+
+    Счётчики окна обновляются атомарными incr/decr; корзина токенов
+    читается и записывается без блокировки, поэтому между процессами
+    она соблюдается приближённо.
+    """
+
+    clock = staticmethod(time.time)
+
+    def __init__(self, cache):
+        self.cache = cache
+
+    def token_bucket(self, key, rate, capacity, now=None):
+        now = self.clock() if now is None else now
+        cache_key = f'notes:throttle:bucket:{key}'
+        tokens, last = self.cache.get(cache_key, (capacity, now))
+        tokens = min(capacity, tokens + (now - last) * rate)
+        timeout = math.ceil(capacity / rate)
+        if tokens >= 1:
+            self.cache.set(cache_key, (tokens - 1, now), timeout)
+            return 0
+        self.cache.set(cache_key, (tokens, now), timeout)
+        return (1 - tokens) / rate
+
+    @staticmethod
+    def _window_key(key, index):
+        return f'notes:throttle:window:{key}:{int(index)}'
+
+    def sliding_window(self, key, limit, window, now=None):
+        now = self.clock() if now is None else now
+        current, elapsed = divmod(now, window)
+        curr_key = self._window_key(key, current)
+        self.cache.add(curr_key, 0, window * 2)
+        try:
+            curr = self.cache.incr(curr_key) - 1
+        except ValueError:
+            self.cache.set(curr_key, 1, window * 2)
+            curr = 0
+        prev = self.cache.get(self._window_key(key, current - 1), 0)
+        if prev * (1 - elapsed / window) + curr + 1 > limit:
+            # Отклонённый запрос не учитывается в окне.
+            self.release_window(key, window, now)
+            return _sliding_window_retry(prev, curr, elapsed, limit, window)
+        return 0
+
+    def release_window(self, key, window, now):
+        try:
+            self.cache.decr(self._window_key(key, now // window))
+        except ValueError:
+            pass
+
+
+class ConcurrencyLimiter:
+    """Ограничивает число одновременно выполняемых запросов в процессе."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.active = 0
+
+    def acquire(self, limit):
+        with self._lock:
+            if self.active >= limit:
+                return False
+            self.active += 1
+            return True
+
+    def release(self):
+        with self._lock:
+            self.active -= 1
+
+
+class CacheConcurrencyLimiter:
+    """Общий для всех процессов лимит параллельных запросов."""
+
+    key = 'notes:throttle:concurrency'
+
+    def __init__(self, cache):
+        self.cache = cache
+
+    def acquire(self, limit):
+        self.cache.add(self.key, 0, CONCURRENCY_TIMEOUT)
+        try:
+            active = self.cache.incr(self.key)
+        except ValueError:
+            self.cache.set(self.key, 1, CONCURRENCY_TIMEOUT)
+            active = 1
+        if active > limit:
+            self.release()
+            return False
+        return True
+
+    def release(self):
+        try:
+            self.cache.decr(self.key)
+        except ValueError:
+            pass
+
+
+local_store = LocalStore()
+write_limiter = ConcurrencyLimiter()
+
+
+def get_store(config):
+    if config['CACHE'] is None:
+        return local_store
+    return CacheStore(caches[config['CACHE']])
+
+
+def get_limiter(config):
+    if config['CACHE'] is None:
+        return write_limiter
+    return CacheConcurrencyLimiter(caches[config['CACHE']])
+
+
+def get_client_ip(request, trusted_proxies=0):
+    """Адрес клиента с учётом доверенных обратных прокси.
+
+    Без прокси используется REMOTE_ADDR: за прокси там окажется его
+    адрес, и все пользователи попадут в одно окно.
+    """
+    if trusted_proxies:
+        forwarded = [
+            address.strip()
+            for address in request.META.get(
+                'HTTP_X_FORWARDED_FOR', ''
+            ).split(',')
+            if address.strip()
+        ]
+        if len(forwarded) >= trusted_proxies:
+            return forwarded[-trusted_proxies]
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def check_rate(request, config):
+    """Время ожидания для запроса или 0, если запрос можно выполнить.
+
+    Если запрос отклоняет корзина пользователя, место в окне IP
+    возвращается: иначе один пользователь тратил бы лимит всех,
+    кто выходит в сеть с того же адреса.
+    """
+    store = get_store(config)
+    now = store.clock()
+    ip_key = f'ip:{get_client_ip(request, config["TRUSTED_PROXY_COUNT"])}'
+    retry_after = store.sliding_window(
+        ip_key, config['IP_LIMIT'], config['IP_WINDOW'], now=now
+    )
+    if not retry_after and request.user.is_authenticated:
+        retry_after = store.token_bucket(
+            f'user:{request.user.pk}',
+            config['USER_RATE'],
+            config['USER_BURST'],
+            now=now,
+        )
+        if retry_after:
+            store.release_window(ip_key, config['IP_WINDOW'], now)
+    return retry_after
+
+
+def too_many_requests(retry_after):
+    response = HttpResponse(
+        THROTTLED_MESSAGE, status=HTTPStatus.TOO_MANY_REQUESTS
+    )
+    response['Retry-After'] = max(1, math.ceil(retry_after))
+    return response
+
+
+def admit(request, handler):
+    """Выполняет handler, если изменяющий запрос проходит ограничения.
+
+    Сначала занимается место среди параллельных запросов, и только потом
+    списываются лимиты, чтобы отклонённый по параллельности запрос
+    не тратил бюджет пользователя.
+    """
+    config = get_config()
+    if request.method in SAFE_METHODS or not config['ENABLED']:
+        return handler()
+    limiter = get_limiter(config)
+    if not limiter.acquire(config['MAX_CONCURRENT_WRITES']):
+        return too_many_requests(1)
+    try:
+        retry_after = check_rate(request, config)
+        if retry_after:
+            return too_many_requests(retry_after)
+        return handler()
+    finally:
+        limiter.release()
+
+
+def admission_control(view):
+    """Ограничивает частоту и параллельность изменяющих запросов."""
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        return admit(request, lambda: view(request, *args, **kwargs))
+
+    return wrapper
+
+
+class AdmissionControlMixin:
+    """Ограничения для CBV; ставится после LoginRequiredMixin."""
+
+    def dispatch(self, request, *args, **kwargs):
+        dispatch = super().dispatch
+        return admit(request, lambda: dispatch(request, *args, **kwargs))
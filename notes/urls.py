@@ -11,5 +11,11 @@ urlpatterns = [
     path('note/<slug:slug>/', views.NoteDetail.as_view(), name='detail'),
     path('delete/<slug:slug>/', views.NoteDelete.as_view(), name='delete'),
     path('notes/', views.NotesList.as_view(), name='list'),
+    path(
+        'autocomplete/',
+        views.NoteAutocomplete.as_view(),
+        name='autocomplete',
+    ),
+    path('jump/', views.NoteJump.as_view(), name='jump'),
     path('done/', views.NoteSuccess.as_view(), name='success'),
 ]
@@ -1,9 +1,13 @@
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.urls import reverse_lazy
+from django.http import Http404, JsonResponse
+from django.shortcuts import get_object_or_404, redirect
+from django.urls import reverse, reverse_lazy
 from django.views import generic
 
+from . import archive, search
 from .forms import NoteForm
-from .models import Note
+from .models import ArchivedNote, Note
+from .throttling import AdmissionControlMixin
 
 
 class Home(generic.TemplateView):
@@ -26,7 +30,7 @@ class NoteBase(LoginRequiredMixin):
         return self.model.objects.filter(author=self.request.user)
 
 
-class NoteCreate(NoteBase, generic.CreateView):
+class NoteCreate(NoteBase, AdmissionControlMixin, generic.CreateView):
     """Добавление заметки."""
     template_name = 'notes/form.html'
     form_class = NoteForm
@@ -38,13 +42,13 @@ class NoteCreate(NoteBase, generic.CreateView):
         return super().form_valid(form)
 
 
-class NoteUpdate(NoteBase, generic.UpdateView):
+class NoteUpdate(NoteBase, AdmissionControlMixin, generic.UpdateView):
     """Редактирование заметки."""
     template_name = 'notes/form.html'
     form_class = NoteForm
 
 
-class NoteDelete(NoteBase, generic.DeleteView):
+class NoteDelete(NoteBase, AdmissionControlMixin, generic.DeleteView):
     """Удаление заметки."""
     template_name = 'notes/delete.html'
 
@@ -53,7 +57,57 @@ class NotesList(NoteBase, generic.ListView):
     """Список всех заметок пользователя."""
     template_name = 'notes/list.html'
 
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['include_archived'] = (
+            self.request.GET.get('archived') == '1'
+        )
+        if context['include_archived']:
+            context['archived_list'] = ArchivedNote.objects.filter(
+                author=self.request.user
+            ).only('note_id', 'title', 'slug')
+        return context
+
 
 class NoteDetail(NoteBase, generic.DetailView):
     """Заметка подробно."""
     template_name = 'notes/detail.html'
+
+    def get_object(self, queryset=None):
+        """Заметка из архива прозрачно возвращается в основную таблицу."""
+        try:
+            note = super().get_object(queryset)
+        except Http404:
+            note = archive.restore(get_object_or_404(
+                ArchivedNote,
+                author=self.request.user,
+                slug=self.kwargs[self.slug_url_kwarg],
+            ))
+        archive.touch(note)
+        return note
+
+
+class NoteAutocomplete(NoteBase, generic.View):
+    """Подсказки по началу заголовка или slug заметки."""
+
+    def get(self, request, *args, **kwargs):
+        suggestions = search.suggest(
+            self.get_queryset(), request.user.pk, request.GET.get('q', '')
+        )
+        return JsonResponse({'results': [
+            {**note, 'url': reverse('notes:detail', args=(note['slug'],))}
+            for note in suggestions
+        ]})
+
+
+class NoteJump(NoteBase, generic.View):
+    """Переход к первой заметке, подходящей под запрос."""
+
+    def get(self, request, *args, **kwargs):
+        suggestions = search.suggest(
+            self.get_queryset(), request.user.pk, request.GET.get('q', ''),
+            limit=1,
+        )
+        if not suggestions:
+            raise Http404('Заметка не найдена')
+        return redirect('notes:detail', slug=suggestions[0]['slug'])
@@ -87,3 +87,20 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 LOGIN_URL = reverse_lazy('users:login')
 LOGIN_REDIRECT_URL = reverse_lazy('notes:home')
+
+NOTES_ARCHIVE_AFTER_DAYS = 365
+NOTES_ARCHIVE_BATCH_SIZE = 500
+
+NOTES_ADMISSION_CONTROL = {
+    'ENABLED': True,
+    'USER_RATE': 1.0,
+    'USER_BURST': 20,
+    'IP_LIMIT': 60,
+    'IP_WINDOW': 60,
+    # Без CACHE лимит действует в каждом процессе отдельно.
+    'MAX_CONCURRENT_WRITES': 4,
+    # За обратным прокси укажите число доверенных прокси, иначе все
+    # клиенты будут ограничиваться по адресу прокси.
+    'TRUSTED_PROXY_COUNT': 0,
+    'CACHE': None,
+}
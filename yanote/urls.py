@@ -4,6 +4,8 @@ from django.contrib.auth.forms import UserCreationForm
 from django.urls import include, path
 from django.views.generic import CreateView
 
+from notes.throttling import admission_control
+
 urlpatterns = [
     path('', include('notes.urls')),
     path('admin/', admin.site.urls),
@@ -24,11 +26,11 @@ auth_urls = ([
     ),
     path(
         'signup/',
-        CreateView.as_view(
+        admission_control(CreateView.as_view(
             form_class=UserCreationForm,
             success_url='/',
             template_name='registration/signup.html',
-        ),
+        )),
         name='signup'
     ),
 ], 'users')